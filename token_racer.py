@@ -2,17 +2,32 @@ import os
 import sys
 import time
 import threading
+import select
 import termios
 import tty
 import random
-from openai import OpenAI
+import unicodedata
+import importlib.util
+from collections import deque, namedtuple
+from itertools import islice
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 
 # ---- LLM SETUP ----
 LLM_API_KEY =   # <- Your OpenRouter API key
 
+# The SDK's default client settings, plus HTTP/2 multiplexing for the chunk
+# requests when the h2 package is installed.
+http_client = DefaultHttpxClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+)
+
 client = OpenAI(
     base_url="https://openrouter.ai/api/v1/",
     api_key=LLM_API_KEY,
+    http_client=http_client,
 )
 
 # ---- GAME CONFIG ----
@@ -22,12 +37,18 @@ PLAYER_CHAR = "🏎"
 OBSTACLE_CHARS = ["#", "*", "~", "@"]
 BASE_FPS = 12
 ROAD_CHUNK_SIZE = 30
+INPUT_TICK = 0.02  # each gear's move_speed is a budget of moves per tick
+OBSTACLE_CHARS_SET = frozenset(OBSTACLE_CHARS)
+OBSTACLE_BYTES = [ord(char) for char in OBSTACLE_CHARS]
+ROAD_ALPHABET = "".join(OBSTACLE_CHARS) + " "
 
 # Console width for centering
 try:
     CONSOLE_WIDTH = os.get_terminal_size().columns
 except Exception:
     CONSOLE_WIDTH = 120  # fallback if can't detect
+ROAD_OFFSET = max(0, (CONSOLE_WIDTH - (ROAD_WIDTH + 2)) // 2)
+ROAD_LEFT_PAD = " " * ROAD_OFFSET
 
 # Game state variables
 game_over = False
@@ -36,10 +57,18 @@ current_gear = 1
 max_gear = 10
 player_x = ROAD_WIDTH // 2
 player_y = DISPLAY_HEIGHT - 3
-road_buffer = []
-input_queue = []
-input_lock = threading.Lock()
+road_buffer = deque()
+input_queue = deque()
+moves_left = 0
+pending_keys = ""
+road_lock = threading.Lock()
+refill_lock = threading.Lock()
+refill_inflight = False
 tokens_generated = 0
+last_llm_error = ""
+last_frame_rows = []
+last_terminal_size = None
+last_frame_road = []
 
 # Gear system - affects both speed and movement responsiveness
 GEAR_SPEEDS = {
@@ -55,14 +84,48 @@ GEAR_SPEEDS = {
     10: {"fps_mult": 3.0, "move_speed": 8, "name": "10th"}
 }
 
+# Static HUD pieces, prebuilt per gear so drawing a frame only formats the score
+HEADER_BAR = "🏁" * 20 + "\n"
+ROAD_TOP_ROW = 6  # screen row of the first road line, below the header block
+ERROR_TEXT_WIDTH = 30  # keeps the token/error row inside 80 columns
+CONTROLS_TEXT = "\n🎮 Controls:\n  WASD or Arrow Keys: Move freely  |  SPACE: Shift gear up  |  Q: Quit\n"
+
+def build_gear_footer(gear):
+    gear_display = "".join(f"[{i}] " if i == gear else f" {i}  " for i in range(1, max_gear + 1))
+    speed_level = int(GEAR_SPEEDS[gear]['fps_mult'] * 5)
+    speed_bar = "█" * speed_level + "▓" * (10 - speed_level)
+    return f"Gears: {gear_display}\nSpeed: [{speed_bar}]\n"
+
+GEAR_STATUS = {gear: f"    Gear: {info['name']}    Speed: {info['fps_mult']:.1f}x\n"
+               for gear, info in GEAR_SPEEDS.items()}
+GEAR_FOOTERS = {gear: build_gear_footer(gear) for gear in GEAR_SPEEDS}
+
+# A road line, its obstacle bitmask (bit N set = obstacle in column N) and
+# the line already centered for drawing
+RoadLine = namedtuple("RoadLine", ["text", "mask", "padded"])
+
+class _RemapTable(dict):
+    # str.translate falls back here for anything outside the road alphabet
+    def __missing__(self, codepoint):
+        return OBSTACLE_CHARS[0]
+
+_REMAP_TABLE = _RemapTable({ord(char): char for char in ROAD_ALPHABET})
+_MASK_TABLE = str.maketrans({char: "1" if char in OBSTACLE_CHARS_SET else "0" for char in ROAD_ALPHABET})
+
+def make_road_line(text, mask):
+    return RoadLine(text, mask, ROAD_LEFT_PAD + text)
+
 def create_safe_road_line(obstacle_positions=None):
     if obstacle_positions is None:
         obstacle_positions = []
+    obstacle_chars = random.choices(OBSTACLE_CHARS, k=len(obstacle_positions))
     road_chars = [" "] * ROAD_WIDTH
-    for pos in obstacle_positions:
+    mask = 0
+    for pos, char in zip(obstacle_positions, obstacle_chars):
         if 0 <= pos < ROAD_WIDTH:
-            road_chars[pos] = random.choice(OBSTACLE_CHARS)
-    return "|" + "".join(road_chars) + "|"
+            road_chars[pos] = char
+            mask |= 1 << pos
+    return make_road_line("|" + "".join(road_chars) + "|", mask)
 
 def validate_and_fix_road_line(line):
     if not line or not (line.startswith("|") and line.endswith("|")):
@@ -70,13 +133,41 @@ def validate_and_fix_road_line(line):
     interior = line[1:-1]
     if len(interior) != ROAD_WIDTH:
         return create_safe_road_line()
-    safe_interior = ""
-    for char in interior:
-        if char in OBSTACLE_CHARS or char == " ":
-            safe_interior += char
-        else:
-            safe_interior += random.choice(OBSTACLE_CHARS) if char != " " else " "
-    return "|" + safe_interior + "|"
+    if interior.strip(ROAD_ALPHABET):
+        interior = interior.translate(_REMAP_TABLE)
+    # Column 0 is the lowest bit, so reverse before parsing as binary
+    mask = int(interior.translate(_MASK_TABLE)[::-1], 2)
+    return make_road_line("|" + interior + "|", mask)
+
+def random_road_lines(count, max_obstacles=2):
+    # Sample every line's obstacles up front and scatter them into one
+    # bytearray covering the whole block, then slice it into lines.
+    counts = random.choices(range(max_obstacles + 1), k=count)
+    positions = random.choices(range(ROAD_WIDTH), k=count * max_obstacles)
+    glyphs = random.choices(OBSTACLE_BYTES, k=count * max_obstacles)
+    cells = bytearray(b" " * (count * ROAD_WIDTH))
+    masks = [0] * count
+    for row, num_obstacles in enumerate(counts):
+        for j in range(row * max_obstacles, row * max_obstacles + num_obstacles):
+            cells[row * ROAD_WIDTH + positions[j]] = glyphs[j]
+            masks[row] |= 1 << positions[j]
+    text = cells.decode("ascii")
+    return [make_road_line("|" + text[row * ROAD_WIDTH:(row + 1) * ROAD_WIDTH] + "|", masks[row])
+            for row in range(count)]
+
+def push_road_line(line):
+    # New lines enter at the far end of the road; the car consumes from the back.
+    with road_lock:
+        road_buffer.appendleft(line)
+
+# Static rules live in the system message so only the short per-chunk
+# request changes between calls (and providers can cache the prefix).
+ROAD_SYSTEM_PROMPT = f"""You generate ASCII race tracks for a car game.
+Each line is EXACTLY {ROAD_WIDTH + 2} chars: '|' + {ROAD_WIDTH} cells + '|'.
+A cell is ' ' (road) or an obstacle: {" ".join(OBSTACLE_CHARS)}. No other characters.
+0-2 obstacles per line, denser at higher diff (1-5); always leave a path through.
+Example: |{("    #" + " " * 10 + "~").ljust(ROAD_WIDTH)}|
+Output ONLY road lines, no other text."""
 
 def llm_generate_road_chunk(previous_lines, chunk_size=ROAD_CHUNK_SIZE, difficulty_level=1):
     road_types = [
@@ -86,67 +177,61 @@ def llm_generate_road_chunk(previous_lines, chunk_size=ROAD_CHUNK_SIZE, difficul
         "desert highway with rockfall hazards"
     ]
     road_type = road_types[min(difficulty_level - 1, len(road_types) - 1)]
-    ascii_obstacles = ", ".join(OBSTACLE_CHARS)
-    prompt = f"""You are generating an ASCII racing track for a high-speed car game.
-
-CRITICAL FORMAT REQUIREMENTS:
-- Each line must be EXACTLY {ROAD_WIDTH + 2} characters long
-- Format: '|' + exactly {ROAD_WIDTH} characters + '|'
-- Use only these obstacle characters: {ascii_obstacles}
-- Use space ' ' for empty road
-- NO other characters allowed (no emoji, no special symbols)
-
-ROAD TYPE: {road_type}
-
-OBSTACLE PLACEMENT:
-- Place 0-2 obstacles per line depending on difficulty
-- Create interesting patterns: clusters, narrow passages, slalom courses
-- Leave clear paths for skilled players
-- Use only the specified ASCII characters: {ascii_obstacles}
-
-DIFFICULTY LEVEL: {difficulty_level}/5
-- Level 1-2: Sparse obstacles, wide passages
-- Level 3-4: More obstacles, tighter passages  
-- Level 5: Dense obstacle courses, narrow gaps
-
-PREVIOUS ROAD CONTEXT:
-{chr(10).join(previous_lines[-5:]) if previous_lines else "Starting new road section"}
-
-Generate {chunk_size} consecutive road lines.
-Each line must be exactly: |{' ' * ROAD_WIDTH}| (with obstacles replacing some spaces)
-
-Output ONLY the road lines, nothing else. No explanations, no extra text."""
+    context = "\n".join(previous_lines[-5:]) if previous_lines else "(start)"
+    prompt = f"type:{road_type} diff:{difficulty_level}/5 prev:\n{context}\nGenerate {chunk_size} lines."
 
+    lines_added = 0
     try:
         result = client.chat.completions.create(
             model="qwen/qwen3-32b",
-            max_tokens=chunk_size * 15,
+            max_tokens=chunk_size * 11 + 20,
             temperature=0.7,
+            stream=True,
+            stream_options={"include_usage": True},
             extra_body={
                 "provider": {"only": ["Cerebras"]},
                 "top_k": 30
             },
             messages=[
-                {"role": "system", "content": "You generate ASCII race tracks. Use ONLY the specified characters. Each line must be EXACTLY the specified length."},
+                {"role": "system", "content": ROAD_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ]
         )
-        
-        global tokens_generated
-        if hasattr(result, 'usage') and result.usage:
-            tokens_generated += result.usage.total_tokens
+
+        global tokens_generated, last_llm_error
+        usage = None
+        content = ""
+        pending = ""
+        for event in result:
+            if event.usage:
+                usage = event.usage
+            if not event.choices or not event.choices[0].delta.content:
+                continue
+            delta = event.choices[0].delta.content
+            content += delta
+            pending += delta
+            while "\n" in pending and lines_added < chunk_size:
+                line, pending = pending.split("\n", 1)
+                line = line.strip()
+                if line:
+                    push_road_line(validate_and_fix_road_line(line))
+                    lines_added += 1
+            if lines_added >= chunk_size or game_over:
+                result.close()
+                break
+        line = pending.strip()
+        if line and lines_added < chunk_size:
+            push_road_line(validate_and_fix_road_line(line))
+            lines_added += 1
+
+        # The stream came through, so any earlier failure is no longer current
+        last_llm_error = ""
+        if usage:
+            tokens_generated += usage.total_tokens
         else:
-            tokens_generated += len(result.choices[0].message.content.split()) * 1.3
-        
-        lines = []
-        raw_lines = result.choices[0].message.content.strip().split("\n")
-        
-        for line in raw_lines:
-            line = line.strip()
-            if line:
-                fixed_line = validate_and_fix_road_line(line)
-                lines.append(fixed_line)
-        while len(lines) < chunk_size:
+            tokens_generated += len(content.split()) * 1.3
+
+        while lines_added < chunk_size:
             num_obstacles = random.randint(0, min(3, difficulty_level))
             obstacle_positions = []
             if num_obstacles > 0:
@@ -165,153 +250,232 @@ Output ONLY the road lines, nothing else. No explanations, no extra text."""
                         pos = random.randint(0, ROAD_WIDTH - 1)
                         if pos not in obstacle_positions:
                             obstacle_positions.append(pos)
-            safe_line = create_safe_road_line(obstacle_positions)
-            lines.append(safe_line)
-        return lines[:chunk_size]
-        
+            push_road_line(create_safe_road_line(obstacle_positions))
+            lines_added += 1
+
     except Exception as e:
-        print(f"LLM error: {e}")
-        fallback_lines = []
-        for i in range(chunk_size):
-            num_obstacles = random.randint(0, 2)
-            obstacle_positions = []
-            for _ in range(num_obstacles):
-                pos = random.randint(0, ROAD_WIDTH - 1)
-                if pos not in obstacle_positions:
-                    obstacle_positions.append(pos)
-            fallback_lines.append(create_safe_road_line(obstacle_positions))
-        return fallback_lines
+        # Shown in the HUD; printing here would scribble over the diffed frame
+        last_llm_error = " ".join(f"LLM error: {e}".split())[:ERROR_TEXT_WIDTH]
+        for line in random_road_lines(chunk_size - lines_added):
+            push_road_line(line)
+            lines_added += 1
+    return lines_added
 
 def initialize_road():
-    global road_buffer
-    road_buffer = llm_generate_road_chunk([], ROAD_CHUNK_SIZE * 3, 1)
-
-def keypress_listener():
-    global game_over, input_queue, current_gear
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    tty.setcbreak(fd)
+    llm_generate_road_chunk([], ROAD_CHUNK_SIZE * 3, 1)
+
+KEY_ACTIONS = {
+    'w': 'up', 'W': 'up',
+    'a': 'left', 'A': 'left',
+    's': 'down', 'S': 'down',
+    'd': 'right', 'D': 'right',
+    ' ': 'gear_up',
+}
+ARROW_ACTIONS = {'A': 'up', 'B': 'down', 'C': 'right', 'D': 'left'}
+QUIT_KEYS = frozenset(['\x03', 'q', 'Q'])
+
+def poll_keys(fd):
+    # Drain whatever is waiting on stdin without blocking. os.read bypasses
+    # sys.stdin's own buffer, which select() can't see into.
+    global game_over, pending_keys
+    keys = pending_keys
+    pending_keys = ""
+    while select.select([fd], [], [], 0)[0]:
+        data = os.read(fd, 64)
+        if not data:
+            break
+        keys += data.decode(errors="ignore")
+    i = 0
+    while i < len(keys):
+        key = keys[i]
+        i += 1
+        if key in KEY_ACTIONS:
+            input_queue.append(KEY_ACTIONS[key])
+        elif key == '\x1b':
+            if len(keys) < i + 2 and keys[i:] in ("", "["):
+                # Sequence split across reads; finish it on the next poll
+                pending_keys = keys[i - 1:]
+                break
+            if keys[i:i + 1] == '[':
+                action = ARROW_ACTIONS.get(keys[i + 1:i + 2])
+                i += 2
+                if action:
+                    input_queue.append(action)
+        elif key in QUIT_KEYS:
+            game_over = True
+
+def process_input(road):
+    # Returns True if any cell the car passes through this frame is an
+    # obstacle, so fast multi-cell moves can't jump over one.
+    global player_x, player_y, current_gear, moves_left
+    moves_this_tick = min(len(input_queue), moves_left)
+    moves_left -= moves_this_tick
+    for _ in range(moves_this_tick):
+        if input_queue:
+            action = input_queue.popleft()
+            if action == 'left' and player_x > 0:
+                player_x -= 1
+            elif action == 'right' and player_x < ROAD_WIDTH - 1:
+                player_x += 1
+            elif action == 'up' and player_y > 0:
+                player_y -= 1
+            elif action == 'down' and player_y < DISPLAY_HEIGHT - 1:
+                player_y += 1
+            elif action == 'gear_up':
+                current_gear = min(max_gear, current_gear + 1)
+            if check_collision(road):
+                return True
+    return False
+
+def refill_threshold():
+    # Faster gears drain the buffer quicker, so keep more road queued up.
+    return ROAD_CHUNK_SIZE * (2 + current_gear // 3)
+
+def refill_chunk_size():
+    # Smaller chunks at high gears arrive sooner, trading calls for latency
+    if current_gear < 5:
+        return ROAD_CHUNK_SIZE
+    if current_gear < 8:
+        return ROAD_CHUNK_SIZE // 2
+    return ROAD_CHUNK_SIZE // 3
+
+def generate_next_chunk():
+    global refill_inflight
     try:
-        while not game_over:
-            key = sys.stdin.read(1)
-            with input_lock:
-                if key.lower() == 'w':
-                    input_queue.append('up')
-                elif key.lower() == 'a':
-                    input_queue.append('left')
-                elif key.lower() == 's':
-                    input_queue.append('down')
-                elif key.lower() == 'd':
-                    input_queue.append('right')
-                elif key == ' ':
-                    input_queue.append('gear_up')
-                elif key == '\x1b':
-                    next1 = sys.stdin.read(1)
-                    if next1 == '[':
-                        next2 = sys.stdin.read(1)
-                        if next2 == 'A':
-                            input_queue.append('up')
-                        elif next2 == 'B':
-                            input_queue.append('down')
-                        elif next2 == 'C':
-                            input_queue.append('right')
-                        elif next2 == 'D':
-                            input_queue.append('left')
-                elif key == '\x03' or key.lower() == 'q':
-                    game_over = True
+        difficulty = min(5, (score // 150) + 1)
+        # The newest lines sit at the left end; list them in travel order so the
+        # last context line is the one the new chunk continues from
+        with road_lock:
+            previous_lines = [line.text for line in islice(road_buffer, 5)][::-1]
+        llm_generate_road_chunk(previous_lines, refill_chunk_size(), difficulty)
     finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-
-def process_input():
-    global player_x, player_y, current_gear, input_queue
-    with input_lock:
-        moves_this_frame = min(len(input_queue), GEAR_SPEEDS[current_gear]["move_speed"])
-        for _ in range(moves_this_frame):
-            if input_queue:
-                action = input_queue.pop(0)
-                if action == 'left' and player_x > 0:
-                    player_x -= 1
-                elif action == 'right' and player_x < ROAD_WIDTH - 1:
-                    player_x += 1
-                elif action == 'up' and player_y > 0:
-                    player_y -= 1
-                elif action == 'down' and player_y < DISPLAY_HEIGHT - 1:
-                    player_y += 1
-                elif action == 'gear_up':
-                    current_gear = min(max_gear, current_gear + 1)
-
-def validate_road_buffer():
-    global road_buffer
-    valid_lines = []
-    for line in road_buffer:
-        fixed_line = validate_and_fix_road_line(line)
-        valid_lines.append(fixed_line)
-    road_buffer = valid_lines
+        with refill_lock:
+            refill_inflight = False
+    # Chain the next request straight away if we are still below the watermark
+    request_road_chunk()
+
+def request_road_chunk():
+    global refill_inflight
+    with refill_lock:
+        if game_over or refill_inflight or len(road_buffer) >= refill_threshold():
+            return
+        refill_inflight = True
+    # Daemon thread, like the other workers, so a request still in flight
+    # never holds up exit on the game-over screen
+    threading.Thread(target=generate_next_chunk, daemon=True).start()
 
 def road_refiller():
-    global road_buffer
     while not game_over:
-        if len(road_buffer) < ROAD_CHUNK_SIZE * 2:
-            difficulty = min(5, (score // 150) + 1)
-            new_chunk = llm_generate_road_chunk(road_buffer[:5], ROAD_CHUNK_SIZE, difficulty)
-            road_buffer = new_chunk + road_buffer
-            validate_road_buffer()
+        request_road_chunk()
         time.sleep(0.2)
 
-def check_collision():
-    global road_buffer, player_x, player_y
-    road_line_index = len(road_buffer) - DISPLAY_HEIGHT + player_y
-    if 0 <= road_line_index < len(road_buffer):
-        road_line = road_buffer[road_line_index]
-        if (road_line.startswith("|") and road_line.endswith("|") and 
-            len(road_line) == ROAD_WIDTH + 2):
-            if 0 <= player_x < ROAD_WIDTH:
-                cell = road_line[player_x + 1]
-                return cell in OBSTACLE_CHARS
-    return False
+def visible_road():
+    # Snapshot the bottom DISPLAY_HEIGHT lines once per frame; deque indexing
+    # away from the ends is linear, so collision and drawing share this list.
+    with road_lock:
+        if len(road_buffer) < DISPLAY_HEIGHT:
+            return []
+        road = list(islice(reversed(road_buffer), DISPLAY_HEIGHT))
+    road.reverse()
+    return road
+
+def check_collision(road):
+    if not 0 <= player_y < len(road):
+        return False
+    return (road[player_y].mask >> player_x) & 1 == 1
+
+def display_width(text):
+    # Terminal columns taken by text: wide glyphs count 2, combining marks 0,
+    # and an emoji presentation selector widens the glyph before it
+    width = 0
+    for char in text:
+        if char == "\ufe0f":
+            width += 1
+        elif not unicodedata.combining(char):
+            width += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+    return width
+
+def write_frame(frame):
+    # Encode once and hand the bytes straight to the fd, bypassing the
+    # text IO stack; loop in case the terminal accepts a partial write.
+    data = memoryview(frame.encode("utf-8"))
+    fd = sys.stdout.fileno()
+    while data:
+        data = data[os.write(fd, data):]
+
+def draw_game_state(road):
+    # Diff the frame against what is already on screen and only repaint the
+    # rows that changed, instead of clearing and redrawing everything.
+    global last_frame_rows, last_frame_road, last_terminal_size
+    frame = [HEADER_BAR]
+    frame.append(f"🏎️  TURBO RACER  🏎️    Score: {score}{GEAR_STATUS[current_gear]}")
+    frame.append(f"🤖 Tokens generated: {int(tokens_generated)}")
+    frame.append(f"    ⚠️  {last_llm_error}\n" if last_llm_error else "\n")
+    frame.append(HEADER_BAR + "\n")
+    if road:
+        # Only the player's row differs from the prebuilt lines
+        display_lines = [line.padded for line in road]
+        if 0 <= player_x < ROAD_WIDTH:
+            col = ROAD_OFFSET + player_x + 1
+            padded = display_lines[player_y]
+            display_lines[player_y] = padded[:col] + PLAYER_CHAR + padded[col + 1:]
+    else:
+        display_lines = [""] * DISPLAY_HEIGHT
+    frame.append("\n".join(display_lines) + "\n")
+    frame.append(CONTROLS_TEXT)
+    frame.append(GEAR_FOOTERS[current_gear])
+    text = "".join(frame)
+    rows = text.split("\n")
 
-def draw_game_state():
-    print("\033[2J\033[H", end="")
-    print("🏁" * 20)
-    gear_info = GEAR_SPEEDS[current_gear]
-    print(f"🏎️  TURBO RACER  🏎️    Score: {score}    Gear: {gear_info['name']}    Speed: {gear_info['fps_mult']:.1f}x")
-    print(f"🤖 Tokens generated: {tokens_generated}")
-    print("🏁" * 20)
-    print()
-    if len(road_buffer) >= DISPLAY_HEIGHT:
-        start_idx = len(road_buffer) - DISPLAY_HEIGHT
-        display_lines = []
-        road_line_length = ROAD_WIDTH + 2
-        road_offset = max(0, (CONSOLE_WIDTH - road_line_length) // 2)
-        left_pad = " " * road_offset
-        for i in range(DISPLAY_HEIGHT):
-            line = road_buffer[start_idx + i]
-            line_chars = list(line)
-            if i == player_y and 0 <= player_x + 1 < len(line_chars):
-                line_chars[player_x + 1] = PLAYER_CHAR
-            display_lines.append(left_pad + "".join(line_chars))
-        for line in display_lines:
-            print(line)
-    print()
-    print("🎮 Controls:")
-    print("  WASD or Arrow Keys: Move freely  |  SPACE: Shift gear up  |  Q: Quit")
-    gear_display = ""
-    for i in range(1, max_gear + 1):
-        if i == current_gear:
-            gear_display += f"[{i}] "
-        else:
-            gear_display += f" {i}  "
-    print(f"Gears: {gear_display}")
-    speed_level = int(gear_info['fps_mult'] * 5)
-    speed_bar = "█" * speed_level + "▓" * (10 - speed_level)
-    print(f"Speed: [{speed_bar}]")
+    try:
+        terminal_size = os.get_terminal_size()
+    except OSError:
+        terminal_size = os.terminal_size((0, 0))
+    if terminal_size != last_terminal_size:
+        # A resize invalidates whatever we think is on screen
+        last_terminal_size = terminal_size
+        last_frame_rows = []
+    # Rows that haven't changed were already measured on an earlier frame
+    if len(last_frame_rows) == len(rows):
+        changed_rows = [row for row, old in zip(rows, last_frame_rows) if row != old]
+    else:
+        changed_rows = rows
+    if (terminal_size.lines < len(rows) or
+            any(display_width(row) > terminal_size.columns for row in changed_rows)):
+        # Absolute positioning and the scroll region need every row on screen
+        # unwrapped; otherwise fall back to a plain clear-and-redraw
+        last_frame_rows = []
+        last_frame_road = []
+        write_frame("\033[2J\033[H" + text)
+        return
+
+    out = []
+    if len(last_frame_rows) != len(rows):
+        out.append("\033[2J")
+        last_frame_rows = [None] * len(rows)
+    elif road and last_frame_road and road[1:] == last_frame_road[:-1]:
+        # The road moved down one line: let the terminal scroll just the road
+        # region so the shifted rows already match and need no repaint
+        top = ROAD_TOP_ROW - 1
+        out.append(f"\033[{ROAD_TOP_ROW};{ROAD_TOP_ROW + DISPLAY_HEIGHT - 1}r\033[{ROAD_TOP_ROW};1H\033M\033[r")
+        last_frame_rows[top:top + DISPLAY_HEIGHT] = [""] + last_frame_rows[top:top + DISPLAY_HEIGHT - 1]
+    for i, row in enumerate(rows):
+        if row != last_frame_rows[i]:
+            out.append(f"\033[{i + 1};1H{row}\033[K")
+    last_frame_rows = rows
+    last_frame_road = road
+    if out:
+        # Park the cursor below the frame
+        out.append(f"\033[{len(rows)};1H")
+        write_frame("".join(out))
 
 # ---- MAIN GAME INITIALIZATION ----
 print("🏎️  Initializing Token Racer...")
 print("🛣️  Generating initial race track...")
 
 initialize_road()
-threading.Thread(target=keypress_listener, daemon=True).start()
+if last_llm_error:
+    print(f"⚠️  {last_llm_error} (using an offline track)")
 threading.Thread(target=road_refiller, daemon=True).start()
 
 print("🏁 Ready to race!")
@@ -319,30 +483,45 @@ print("🏁 Ready to race!")
 print("\nPress ENTER to start...")
 input()
 
+stdin_fd = sys.stdin.fileno()
+old_settings = termios.tcgetattr(stdin_fd)
+tty.setcbreak(stdin_fd)
 try:
-    last_move_time = time.time()
+    next_deadline = next_input_tick = time.monotonic()
     while not game_over:
-        current_time = time.time()
-        process_input()
+        poll_keys(stdin_fd)
         if len(road_buffer) < DISPLAY_HEIGHT + 10:
-            difficulty = min(5, (score // 150) + 1)
-            new_chunk = llm_generate_road_chunk(road_buffer[:5], ROAD_CHUNK_SIZE, difficulty)
-            road_buffer = new_chunk + road_buffer
-            validate_road_buffer()
-        if check_collision():
+            request_road_chunk()
+        now = time.monotonic()
+        if now >= next_input_tick:
+            moves_left = GEAR_SPEEDS[current_gear]["move_speed"]
+            next_input_tick = now + INPUT_TICK
+        if now >= next_deadline:
+            with road_lock:
+                if len(road_buffer) > DISPLAY_HEIGHT + 10:
+                    road_buffer.pop()
+            score += current_gear
+            gear_info = GEAR_SPEEDS[current_gear]
+            frame_delay = 1.0 / (BASE_FPS * gear_info["fps_mult"])
+            # Don't try to catch up on frames missed during a stall
+            next_deadline += frame_delay
+            if next_deadline < now:
+                next_deadline = now + frame_delay
+        road = visible_road()
+        # Check the car's cell before moving, in case an obstacle scrolled
+        # onto it; process_input then checks every cell it moves through
+        if check_collision(road) or process_input(road):
             game_over = True
             break
-        gear_info = GEAR_SPEEDS[current_gear]
-        frame_delay = 1.0 / (BASE_FPS * gear_info["fps_mult"])
-        if current_time - last_move_time >= frame_delay:
-            if len(road_buffer) > DISPLAY_HEIGHT + 10:
-                road_buffer.pop()
-            score += current_gear
-            last_move_time = current_time
-        draw_game_state()
-        time.sleep(0.02)
+        draw_game_state(road)
+        # Sleep until the next frame is due, waking early for a keypress or,
+        # while moves are still queued, for the next input tick's budget
+        wake_at = min(next_deadline, next_input_tick) if input_queue else next_deadline
+        select.select([stdin_fd], [], [], max(0, wake_at - time.monotonic()))
 except KeyboardInterrupt:
     game_over = True
+finally:
+    termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_settings)
 
 print("\033[2J\033[H", end="")
 print("💥" * 25)